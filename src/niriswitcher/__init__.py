@@ -11,13 +11,7 @@ def daemon():
 
     import signal
 
-    from ._config import (
-        config,
-        DEFAULT_CSS_PROVIDER,
-        DEFAULT_USER_CSS_PROVIDER,
-        DEFAULT_DARK_CSS_PROVIDER,
-        DEFAULT_DARK_USER_CSS_PROVIDER,
-    )
+    from ._config import config, load_system_style, load_user_style
 
     import logging
 
@@ -27,60 +21,71 @@ def daemon():
 
     from ._app import NiriswicherApp
     from ._wm import NiriWindowManager
-    from gi.repository import Gtk, Gdk
+    from gi.repository import Gtk, Gdk, GLib
 
     logger.info("Starting niriswitcher daemon")
 
+    default_css_provider = load_system_style(filename="style.css")
+    dark_css_provider = load_system_style(filename="style-dark.css")
+    user_css_provider = load_user_style(filename="style.css")
+    dark_user_css_provider = load_user_style(filename="style-dark.css")
+
+    display = Gdk.Display.get_default()
+    dark_style_attached = False
+
     def _set_dark_style():
+        nonlocal dark_style_attached
+        if dark_style_attached:
+            return
+
         Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            DEFAULT_DARK_CSS_PROVIDER,
+            display,
+            dark_css_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 1,
         )
-        if DEFAULT_DARK_USER_CSS_PROVIDER is not None:
+        if dark_user_css_provider is not None:
             Gtk.StyleContext.add_provider_for_display(
-                Gdk.Display.get_default(),
-                DEFAULT_DARK_USER_CSS_PROVIDER,
+                display,
+                dark_user_css_provider,
                 Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 3,
             )
+        dark_style_attached = True
+
+    def _unset_dark_style():
+        nonlocal dark_style_attached
+        if not dark_style_attached:
+            return
+
+        Gtk.StyleContext.remove_provider_for_display(display, dark_css_provider)
+        if dark_user_css_provider is not None:
+            Gtk.StyleContext.remove_provider_for_display(
+                display, dark_user_css_provider
+            )
+        dark_style_attached = False
 
     def on_dark(style_manager, prop):
         if style_manager.get_dark():
             _set_dark_style()
         else:
-            Gtk.StyleContext.remove_provider_for_display(
-                Gdk.Display.get_default(), DEFAULT_DARK_CSS_PROVIDER
-            )
-            if DEFAULT_DARK_USER_CSS_PROVIDER is not None:
-                Gtk.StyleContext.remove_provider_for_display(
-                    Gdk.Display.get_default(), DEFAULT_DARK_USER_CSS_PROVIDER
-                )
+            _unset_dark_style()
 
     window_manager = NiriWindowManager()
     app = NiriswicherApp(window_manager)
 
-    def signal_handler(signum, frame):
-        if app._should_present_windows():
-            if config.general.separate_workspaces:
-                app.window.populate_separate_workspaces(
-                    mru_sort=config.general.workspace_mru_sort,
-                    active_output=config.general.current_output_only,
-                )
-            else:
-                app.window.populate_unified_workspace(
-                    active_output=config.general.current_output_only
-                )
-            app.window.set_visible(True)
+    def signal_handler():
+        # Dispatched by the GLib main loop, so it can't interleave with GTK
+        app.present_windows()
+        return GLib.SOURCE_CONTINUE
 
     Gtk.StyleContext.add_provider_for_display(
-        Gdk.Display.get_default(),
-        DEFAULT_CSS_PROVIDER,
+        display,
+        default_css_provider,
         Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION,
     )
-    if DEFAULT_USER_CSS_PROVIDER is not None:
+    if user_css_provider is not None:
         Gtk.StyleContext.add_provider_for_display(
-            Gdk.Display.get_default(),
-            DEFAULT_USER_CSS_PROVIDER,
+            display,
+            user_css_provider,
             Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 2,
         )
 
@@ -92,7 +97,7 @@ def daemon():
     if config.appearance.system_theme == "auto":
         app.get_style_manager().connect("notify::dark", on_dark)
 
-    signal.signal(signal.SIGUSR1, signal_handler)
+    GLib.unix_signal_add(GLib.PRIORITY_HIGH, signal.SIGUSR1, signal_handler)
     app.register(None)
     if app.get_is_remote():
         logger.info("niriswitcher is already running...")
@@ -103,7 +108,6 @@ def daemon():
 def control():
     import sys
     import argparse
-    from gi.repository import Gio, GLib
 
     parser = argparse.ArgumentParser(description="Control niriswitcher")
     subparsers = parser.add_subparsers(dest="command", help="Commands")
@@ -121,6 +125,9 @@ def control():
         parser.print_help()
         return 1
 
+    # Only load GObject introspection once there is something to send
+    from gi.repository import Gio, GLib
+
     try:
         bus = Gio.bus_get_sync(Gio.BusType.SESSION, None)
         proxy = Gio.DBusProxy.new_sync(
@@ -1,10 +1,15 @@
 import logging
 import math
 
-from gi.repository import Gtk
+from gi.repository import Adw, Gtk
 
 logger = logging.getLogger(__name__)
 
+# Constants for the back easing functions
+_BACK_C1 = 1.70158
+_BACK_C2 = _BACK_C1 * 1.525
+_BACK_C3 = _BACK_C1 + 1
+
 
 def ease_in_cubic(t):
     """
@@ -35,7 +40,8 @@ def ease_in_out_cubic(t):
     if t < 0.5:
         return 4 * t * t * t
     else:
-        return 1 - pow(-2 * t + 2, 3) / 2
+        u = -2 * t + 2
+        return 1 - u * u * u / 2
 
 
 def ease_out_cubic(t):
@@ -52,7 +58,8 @@ def ease_out_cubic(t):
     Returns:
         float: The eased value.
     """
-    return 1 - pow(1 - t, 3)
+    u = 1 - t
+    return 1 - u * u * u
 
 
 def linear(t):
@@ -341,9 +348,7 @@ def ease_in_back(t):
     Returns:
         float: The eased value.
     """
-    c1 = 1.70158
-    c3 = c1 + 1
-    return c3 * t * t * t - c1 * t * t
+    return _BACK_C3 * t * t * t - _BACK_C1 * t * t
 
 
 def ease_out_back(t):
@@ -356,9 +361,8 @@ def ease_out_back(t):
     Returns:
         float: The eased value.
     """
-    c1 = 1.70158
-    c3 = c1 + 1
-    return 1 + c3 * pow(t - 1, 3) + c1 * pow(t - 1, 2)
+    u = t - 1
+    return 1 + _BACK_C3 * u * u * u + _BACK_C1 * u * u
 
 
 def ease_in_out_back(t):
@@ -371,12 +375,10 @@ def ease_in_out_back(t):
     Returns:
         float: The eased value.
     """
-    c1 = 1.70158
-    c2 = c1 * 1.525
     if t < 0.5:
-        return (pow(2 * t, 2) * ((c2 + 1) * 2 * t - c2)) / 2
+        return (pow(2 * t, 2) * ((_BACK_C2 + 1) * 2 * t - _BACK_C2)) / 2
     else:
-        return (pow(2 * t - 2, 2) * ((c2 + 1) * (t * 2 - 2) + c2) + 2) / 2
+        return (pow(2 * t - 2, 2) * ((_BACK_C2 + 1) * (t * 2 - 2) + _BACK_C2) + 2) / 2
 
 
 EASING_FUNCTIONS = {
@@ -408,6 +410,48 @@ EASING_FUNCTIONS = {
 }
 
 
+ADW_EASINGS = {
+    linear: Adw.Easing.LINEAR,
+    ease_in_quad: Adw.Easing.EASE_IN_QUAD,
+    ease_out_quad: Adw.Easing.EASE_OUT_QUAD,
+    ease_in_out_quad: Adw.Easing.EASE_IN_OUT_QUAD,
+    ease_in_cubic: Adw.Easing.EASE_IN_CUBIC,
+    ease_out_cubic: Adw.Easing.EASE_OUT_CUBIC,
+    ease_in_out_cubic: Adw.Easing.EASE_IN_OUT_CUBIC,
+    ease_in_quart: Adw.Easing.EASE_IN_QUART,
+    ease_out_quart: Adw.Easing.EASE_OUT_QUART,
+    ease_in_out_quart: Adw.Easing.EASE_IN_OUT_QUART,
+    ease_in_quint: Adw.Easing.EASE_IN_QUINT,
+    ease_out_quint: Adw.Easing.EASE_OUT_QUINT,
+    ease_in_out_quint: Adw.Easing.EASE_IN_OUT_QUINT,
+    ease_in_sine: Adw.Easing.EASE_IN_SINE,
+    ease_out_sine: Adw.Easing.EASE_OUT_SINE,
+    ease_in_out_sine: Adw.Easing.EASE_IN_OUT_SINE,
+    ease_in_expo: Adw.Easing.EASE_IN_EXPO,
+    ease_out_expo: Adw.Easing.EASE_OUT_EXPO,
+    ease_in_out_expo: Adw.Easing.EASE_IN_OUT_EXPO,
+    ease_in_circ: Adw.Easing.EASE_IN_CIRC,
+    ease_out_circ: Adw.Easing.EASE_OUT_CIRC,
+    ease_in_out_circ: Adw.Easing.EASE_IN_OUT_CIRC,
+    ease_in_back: Adw.Easing.EASE_IN_BACK,
+    ease_out_back: Adw.Easing.EASE_OUT_BACK,
+    ease_in_out_back: Adw.Easing.EASE_IN_OUT_BACK,
+}
+
+
+def get_adw_easing(easing):
+    """
+    Return the libadwaita equivalent of one of the easing functions above.
+
+    Args:
+        easing (callable): An easing function from this module.
+
+    Returns:
+        Adw.Easing: The matching easing, or ease-out-cubic if there is none.
+    """
+    return ADW_EASINGS.get(easing, Adw.Easing.EASE_OUT_CUBIC)
+
+
 def get_easing_function(name, *, default):
     if func := EASING_FUNCTIONS.get(name):
         return func
@@ -1,16 +1,18 @@
 from __future__ import annotations
 
+import functools
 import logging
 import operator
 import inspect
 from typing import TYPE_CHECKING, Callable, Union
 
-from gi.repository import Adw, Gdk, Gio, GLib, Gtk, Pango
+from gi.repository import Adw, Gdk, Gio, GLib, Gsk, Gtk, Pango
 from gi.repository import Gtk4LayerShell as LayerShell
 
+from ._anim import get_adw_easing
 from ._config import config
 from ._widgets import (
-    WidgetPropertyAnimation,
+    ApplicationViewCache,
     WorkspaceIndicator,
     WorkspaceStack,
     WorkspaceView,
@@ -21,8 +23,12 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+_DEFAULT_MOD_MASK = Gtk.accelerator_get_default_mod_mask()
+
 
 class KeybindingAction:
+    __slots__ = ("keyval", "state", "action", "mod_count", "masked_state", "arg_count")
+
     action: Union[Callable[[], None], Callable[[int], None]]
 
     def __init__(
@@ -35,7 +41,8 @@ class KeybindingAction:
         )
         self.state = mapping[1]
         self.action = action
-        self.mod_count = bin(int(self.state)).count("1")
+        self.mod_count = int(self.state).bit_count()
+        self.masked_state = self.state & _DEFAULT_MOD_MASK
         sig = inspect.signature(self.action)
         self.arg_count = len(
             [
@@ -49,14 +56,6 @@ class KeybindingAction:
             ]
         )
 
-    def matches(self, keyval, state):
-        if keyval in self.keyval and (
-            (state & Gtk.accelerator_get_default_mod_mask())
-            == (self.state & Gtk.accelerator_get_default_mod_mask())
-        ):
-            return True
-        return False
-
     def execute(self, keyval):
         try:
             if self.arg_count == 1:
@@ -81,33 +80,52 @@ NUMBER_KEY_TO_NUMBER: dict[int, int] = {
 }
 
 
+@functools.lru_cache(maxsize=None)
+def normalize_keyval(keyval: int) -> int:
+    """
+    Returns the lower case keyval used to match key bindings, mapping
+    Shift+Tab (ISO_Left_Tab) to Tab.
+    """
+    if keyval == Gdk.KEY_ISO_Left_Tab:
+        return Gdk.KEY_Tab
+    return Gdk.keyval_to_lower(keyval)
+
+
 class NiriswitcherWindow(Gtk.Window):
     def __init__(self, app, window_manager: NiriWindowManager):
         super().__init__(application=app, title="niriswitcher")
         self.window_manager = window_manager
-
-        def show_hide_duration(visible):
-            return (
-                config.appearance.animation.activate.show_duration
-                if visible
-                else config.appearance.animation.activate.hide_duration
-            )
-
-        self.set_visible = WidgetPropertyAnimation(
-            self.set_visible,
-            before=lambda x: x,
-            setter=self.set_opacity,
-            initial=0.01,
-            target=1,
-            duration=show_hide_duration,
-            easing=config.appearance.animation.activate.easing,
+        self.application_view_cache = ApplicationViewCache()
+        self._workspace_views = {}
+
+        self._display = Gdk.Display.get_default()
+        self._monitors_by_connector = {}
+        monitors = self._display.get_monitors()
+        monitors.connect("items-changed", self._on_monitors_changed)
+        self._on_monitors_changed(monitors, 0, 0, 0)
+
+        # The fade is driven by libadwaita on the frame clock, so no Python
+        # runs per frame while the switcher is shown or hidden
+        self._revealed = False
+        self._reveal_animation = Adw.TimedAnimation.new(
+            self,
+            0.01,
+            1,
+            config.appearance.animation.activate.show_duration,
+            Adw.PropertyAnimationTarget.new(self, "opacity"),
+        )
+        self._reveal_animation.set_easing(
+            get_adw_easing(config.appearance.animation.activate.easing)
         )
+        self._reveal_animation.connect("done", self._on_reveal_done)
+        self.set_visible = self._set_visible_animated
 
         self.current_application_title = Gtk.Label()
         self.current_application_title.set_ellipsize(Pango.EllipsizeMode.END)
         self.current_application_title.set_max_width_chars(1)
         self.current_application_title.set_hexpand(True)
         self.current_application_title.set_name("application-title")
+        self._application_title = ""
 
         self.current_workspace_name = Gtk.Label()
         self.current_workspace_name.set_ellipsize(Pango.EllipsizeMode.END)
@@ -169,32 +187,70 @@ class NiriswitcherWindow(Gtk.Window):
         self.set_name("niriswitcher")
         self.set_default_size(-1, 100)
 
+        LayerShell.init_for_window(self)
+        LayerShell.set_namespace(self, "niriswitcher")
+        LayerShell.set_layer(self, LayerShell.Layer.OVERLAY)
+        LayerShell.auto_exclusive_zone_enable(self)
+        LayerShell.set_keyboard_mode(self, LayerShell.KeyboardMode.EXCLUSIVE)
+
         key_controller = Gtk.EventControllerKey.new()
+        # Handle keys before any child widget gets a chance to consume them
+        key_controller.set_propagation_phase(Gtk.PropagationPhase.CAPTURE)
         key_controller.connect("key-released", self.on_key_released)
         key_controller.connect("key-pressed", self.on_key_pressed)
         self.add_controller(key_controller)
+        self.connect("realize", self.on_realize)
         self.connect("map", self.on_map)
         self.connect("show", self.on_show)
         self.connect("hide", self.on_hide)
 
+        # Connected for the lifetime of the window; the handlers ignore
+        # events while the switcher is hidden
+        self.window_manager.connect("window-closed", self.on_window_closed)
+        self.window_manager.connect("workspace-activated", self.on_workspace_activated)
+        self.window_manager.connect(
+            "window-focus-changed", self.on_window_focus_changed
+        )
+
         self.keybindings = self._create_keybindings()
 
+    def _set_visible_animated(self, visible):
+        animation = self._reveal_animation
+        self._revealed = visible
+        if visible:
+            animation.set_value_from(0.01)
+            animation.set_value_to(1)
+            animation.set_duration(config.appearance.animation.activate.show_duration)
+            self.set_opacity(0.01)
+            Gtk.Window.set_visible(self, True)
+        else:
+            animation.set_value_from(self.get_opacity())
+            animation.set_value_to(0.01)
+            animation.set_duration(config.appearance.animation.activate.hide_duration)
+        animation.play()
+
+    def _on_reveal_done(self, animation):
+        if not self._revealed:
+            Gtk.Window.set_visible(self, False)
+
     def on_key_released(self, controller, keyval, keycode, state):
         if keyval == config.keys.modifier:
             self.focus_selected_window()
 
     def on_key_pressed(self, controller, keyval, keycode, state):
-        if keyval == Gdk.KEY_ISO_Left_Tab:
-            keyval = Gdk.KEY_Tab
-
-        keyval = Gdk.keyval_to_lower(keyval)
-
-        for keybinding in self.keybindings:
-            if keybinding.matches(keyval, state):
+        keyval = normalize_keyval(keyval)
+        # The bindings are indexed by keyval, so only the modifiers are left
+        # to compare
+        masked_state = state & _DEFAULT_MOD_MASK
+        for keybinding in self.keybindings.get(keyval, ()):
+            if keybinding.masked_state == masked_state:
                 keybinding.execute(keyval)
                 break
 
     def on_window_closed(self, wm, window):
+        if not self.is_visible():
+            return
+
         for workspace_view in self.workspace_stack:
             if workspace_view.remove_by_window_id(window.id):
                 if workspace_view.is_empty():
@@ -216,17 +272,19 @@ class NiriswitcherWindow(Gtk.Window):
         self._set_workspace_name(workspace)
 
     def on_window_focus_changed(self, vm, window):
+        if not self.is_visible():
+            return
+
         workspace_view = self.workspace_stack.get_visible_child()
-        for application_view in workspace_view:
-            if application_view.window.id == window.id:
-                application_view.focus()
-                workspace_view.scroll_to(application_view)
-            else:
-                application_view.unfocus()
+        workspace_view.focus_window(window.id)
 
     def on_application_selection_changed(self, widget: Gtk.Widget, window: Window):
+        # Hovering back and forth re-emits the same selection; only touch the
+        # label when the title actually changes
         title = window.title if window.title is not None else ""
-        self.current_application_title.set_label(title)
+        if title != self._application_title:
+            self._application_title = title
+            self.current_application_title.set_label(title)
         if not config.general.separate_workspaces:
             workspace = self.window_manager.get_workspace(window.workspace_id)
             if workspace is not None:
@@ -236,54 +294,62 @@ class NiriswitcherWindow(Gtk.Window):
         window.close()
 
     def on_focus_requested(self, widget, window, hide):
-        window.focus()
-        if config.general.center_on_focus:
-            window.center()
+        window.focus(center=config.general.center_on_focus)
 
         if hide:
             self.set_visible(False)
 
+    def on_realize(self, window):
+        if not config.general.disable_effects_when_software_rendered:
+            return
+
+        # Stack transitions, size interpolation and CSS transitions and
+        # shadows are expensive when every frame is drawn on the CPU
+        if isinstance(self.get_renderer(), Gsk.CairoRenderer):
+            logger.info("Software rendering detected, disabling effects")
+            self.workspace_stack.set_transition_type(Gtk.StackTransitionType.NONE)
+            self.workspace_stack.set_interpolate_size(False)
+            provider = Gtk.CssProvider()
+            provider.load_from_data("* { transition: none; box-shadow: none; }", -1)
+            Gtk.StyleContext.add_provider_for_display(
+                self._display,
+                provider,
+                Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION + 4,
+            )
+
     def on_map(self, window):
         surface = self.get_surface()
         surface.inhibit_system_shortcuts(None)
 
     def on_hide(self, widget):
-        self.window_manager.disconnect_by_func(self.on_window_closed)
-        self.window_manager.disconnect_by_func(self.on_window_focus_changed)
-        self.window_manager.disconnect_by_func(self.on_workspace_activated)
-        for child in list(self.workspace_stack):
-            self.workspace_stack.remove(child)
+        # Workspace views are kept (see _get_workspace_view) so that an
+        # unchanged set of windows can be shown again without rebuilding
+        self.workspace_stack.clear()
+        self.application_view_cache.prune()
 
-        for child in list(self.workspace_indicator):
-            self.workspace_indicator.remove(child)
+        self.workspace_indicator.clear()
 
         self.current_application = None
 
-    def on_show(self, widget):
-        display = Gdk.Display.get_default()
+    def _on_monitors_changed(self, monitors, position, removed, added):
+        self._monitors_by_connector = {
+            monitor.get_connector(): monitor for monitor in monitors
+        }
 
+    def on_show(self, widget):
         workspace = self.window_manager.get_active_workspace()
-        if not any(
-            (monitor := m).get_connector() == workspace.output
-            for m in display.get_monitors()
-        ):
-            monitor = display.get_monitor_at_surface(self.get_surface())
+        monitor = self._monitors_by_connector.get(workspace.output)
+        if monitor is None:
+            monitor = self._display.get_monitor_at_surface(self.get_surface())
 
         LayerShell.set_monitor(self, monitor)
         geometry = monitor.get_geometry()
 
+        appearance = config.appearance
         screen_width = int(geometry.width * 0.9)
         self.workspace_stack.set_width(
-            min(config.appearance.min_width, screen_width),
-            min(config.appearance.max_width, screen_width),
-        )
-        self.window_manager.connect("window-closed", self.on_window_closed)
-        self.window_manager.connect(
-            "workspace-activated",
-            self.on_workspace_activated,
-        )
-        self.window_manager.connect(
-            "window-focus-changed", self.on_window_focus_changed
+            min(appearance.min_width, screen_width),
+            min(appearance.max_width, screen_width),
         )
 
     def _set_workspace_name(self, workspace: Workspace):
@@ -317,32 +383,72 @@ class NiriswitcherWindow(Gtk.Window):
                     self._select_workspace_by_idx,
                 )
             )
-        return sorted(
+        # Index the bindings by keyval so that a key press only has to check
+        # the bindings for that key, most specific modifiers first
+        keybindings: dict[int, list[KeybindingAction]] = {}
+        for keybinding in sorted(
             mappings,
             key=operator.attrgetter("mod_count"),
             reverse=True,
-        )
+        ):
+            for keyval in keybinding.keyval:
+                keybindings.setdefault(keyval, []).append(keybinding)
+        return {keyval: tuple(actions) for keyval, actions in keybindings.items()}
+
+    def _get_workspace_view(self, previous, key, workspace, windows, lazy=False):
+        """
+        Return the workspace view to show for `windows`.
+
+        The view from the previous showing of the same workspace is reused,
+        and synced if the windows have changed; otherwise a new view is built.
+        A new `lazy` view only builds its application views once selected.
+        """
+        retained = previous.pop(key, None)
+        if retained is not None:
+            retained_windows, workspace_view = retained
+            if workspace_view.workspace is workspace:
+                if retained_windows != windows:
+                    workspace_view.sync(windows)
+                workspace_view.reset()
+                for application_view in workspace_view:
+                    self.application_view_cache.add(application_view)
+                self._workspace_views[key] = (windows, workspace_view)
+                return workspace_view
+            workspace_view.release_applications()
 
-    def populate_unified_workspace(self, active_output=False):
-        windows = self.window_manager.get_windows(
-            active_workspace=False, active_output=active_output
-        )
         workspace_view = WorkspaceView(
-            None,
+            workspace,
             windows,
             icon_size=config.appearance.icon_size,
+            view_cache=self.application_view_cache,
+            lazy=lazy,
         )
-        workspace_view.set_scroll_duration(config.appearance.animation.switch.duration)
-        workspace_view.set_scroll_easing(config.appearance.animation.switch.easing)
-        workspace_view.set_resize_duration(config.appearance.animation.resize.duration)
-        workspace_view.set_resize_easing(config.appearance.animation.resize.easing)
+        animation = config.appearance.animation
+        workspace_view.set_scroll_duration(animation.switch.duration)
+        workspace_view.set_scroll_easing(animation.switch.easing)
+        workspace_view.set_resize_duration(animation.resize.duration)
+        workspace_view.set_resize_easing(animation.resize.easing)
         workspace_view.connect("focus-requested", self.on_focus_requested)
         workspace_view.connect("close-requested", self.on_close_requested)
         workspace_view.connect(
             "selection-changed", self.on_application_selection_changed
         )
+        self._workspace_views[key] = (windows, workspace_view)
+        return workspace_view
+
+    def _release_workspace_views(self, previous):
+        for _, workspace_view in previous.values():
+            workspace_view.release_applications()
+
+    def populate_unified_workspace(self, active_output=False):
+        windows = self.window_manager.get_windows(
+            active_workspace=False, active_output=active_output
+        )
+        previous, self._workspace_views = self._workspace_views, {}
+        workspace_view = self._get_workspace_view(previous, "all", None, windows)
+        self._release_workspace_views(previous)
         self.workspace_indicator.set_visible(False)
-        self.workspace_stack.add_named(workspace_view, "all")
+        self.workspace_stack.add_view(workspace_view, "all")
         workspace_view.select_next()
 
     def populate_separate_workspaces(
@@ -352,32 +458,23 @@ class NiriswitcherWindow(Gtk.Window):
         workspaces = self.window_manager.get_workspaces(
             mru=mru_sort, active_output=active_output
         )
+        windows_by_workspace = self.window_manager.get_windows_by_workspace()
+        previous, self._workspace_views = self._workspace_views, {}
+        add_workspace = self.workspace_stack.add_workspace
         for current_workspace in workspaces:
-            windows = self.window_manager.get_windows(workspace_id=current_workspace.id)
-            if len(windows) > 0:
-                workspace_view = WorkspaceView(
+            windows = windows_by_workspace.get(current_workspace.id)
+            if windows:
+                # Only the selected workspace is shown, so the others are
+                # built on demand
+                workspace_view = self._get_workspace_view(
+                    previous,
+                    current_workspace.identifier,
                     current_workspace,
                     windows,
-                    icon_size=config.appearance.icon_size,
-                )
-                workspace_view.set_scroll_duration(
-                    config.appearance.animation.switch.duration
-                )
-                workspace_view.set_scroll_easing(
-                    config.appearance.animation.switch.easing
-                )
-                workspace_view.set_resize_duration(
-                    config.appearance.animation.resize.duration
-                )
-                workspace_view.set_resize_easing(
-                    config.appearance.animation.resize.easing
-                )
-                workspace_view.connect(
-                    "selection-changed", self.on_application_selection_changed
+                    lazy=True,
                 )
-                workspace_view.connect("focus-requested", self.on_focus_requested)
-                workspace_view.connect("close-requested", self.on_close_requested)
-                self.workspace_stack.add_workspace(workspace_view)
+                add_workspace(workspace_view)
+        self._release_workspace_views(previous)
 
         if mru_select:
             if not mru_sort:
@@ -388,10 +485,7 @@ class NiriswitcherWindow(Gtk.Window):
                 )
             active_workspace = None
             for current_workspace in workspaces[1:]:
-                windows = self.window_manager.get_windows(
-                    workspace_id=current_workspace.id
-                )
-                if len(windows) > 0:
+                if windows_by_workspace.get(current_workspace.id):
                     active_workspace = current_workspace
                     break
             if active_workspace is None:
@@ -404,7 +498,7 @@ class NiriswitcherWindow(Gtk.Window):
             self.workspace_indicator.select_by_workspace_id(
                 active_workspace.id, animate=False
             )
-            current_workspace = self.workspace_stack.get_child_by_name(
+            current_workspace = self.workspace_stack.get_workspace_view(
                 active_workspace.identifier
             )
             if current_workspace is not None:
@@ -476,16 +570,15 @@ class NiriswicherApp(Adw.Application):
             flags=Gio.ApplicationFlags.FLAGS_NONE,
         )
         self.window_manager = window_manager
+        self.window = None
         self._dbus_registration_id = None
 
     def do_activate(self):
-        self.window = NiriswitcherWindow(self, self.window_manager)
-        LayerShell.init_for_window(self.window)
-        LayerShell.set_namespace(self.window, "niriswitcher")
-        LayerShell.set_layer(self.window, LayerShell.Layer.OVERLAY)
-        LayerShell.auto_exclusive_zone_enable(self.window)
-        LayerShell.set_keyboard_mode(self.window, LayerShell.KeyboardMode.EXCLUSIVE)
+        # The switcher window is persistent; only create it the first time
+        if self.window is not None:
+            return
 
+        self.window = NiriswitcherWindow(self, self.window_manager)
         self.window.connect("notify::visible", self._on_window_visibility_changed)
 
     def _on_window_visibility_changed(self, window, pspec):
@@ -522,6 +615,22 @@ class NiriswicherApp(Adw.Application):
         n_workspaces = self.window_manager.get_n_workspaces(active_output=active_output)
         return n_windows > 0 and n_workspaces > 1
 
+    def present_windows(self):
+        if self._should_present_windows(
+            active_output=config.general.current_output_only
+        ):
+            if config.general.separate_workspaces:
+                self.window.populate_separate_workspaces(
+                    mru_sort=config.workspace.mru_sort_in_workspace,
+                    active_output=config.general.current_output_only,
+                )
+            else:
+                self.window.populate_unified_workspace(
+                    active_output=config.general.current_output_only
+                )
+
+            self.window.set_visible(True)
+
     def _handle_dbus_method(
         self,
         connection,
@@ -534,20 +643,7 @@ class NiriswicherApp(Adw.Application):
     ):
         try:
             if method_name == "application":
-                if self._should_present_windows(
-                    active_output=config.general.current_output_only
-                ):
-                    if config.general.separate_workspaces:
-                        self.window.populate_separate_workspaces(
-                            mru_sort=config.workspace.mru_sort_in_workspace,
-                            active_output=config.general.current_output_only,
-                        )
-                    else:
-                        self.window.populate_unified_workspace(
-                            active_output=config.general.current_output_only
-                        )
-
-                    self.window.set_visible(True)
+                self.present_windows()
                 invocation.return_value(None)
             elif method_name == "workspace":
                 if config.general.separate_workspaces:
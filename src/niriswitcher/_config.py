@@ -1,5 +1,3 @@
-import importlib
-import importlib.resources
 import logging
 import os
 from dataclasses import dataclass
@@ -24,6 +22,7 @@ class GeneralConfig:
     double_click_to_hide: bool = False
     center_on_focus: bool = False
     current_output_only: bool = False
+    disable_effects_when_software_rendered: bool = True
     log_level: str = "WARN"
 
 
@@ -105,6 +104,29 @@ class Config:
     appearance: AppearanceConfig = AppearanceConfig()
 
 
+MODIFIER_KEY_TO_MASK: dict[int, Gdk.ModifierType] = {
+    Gdk.KEY_Alt_L: Gdk.ModifierType.ALT_MASK,
+    Gdk.KEY_Alt_R: Gdk.ModifierType.ALT_MASK,
+    Gdk.KEY_Super_L: Gdk.ModifierType.SUPER_MASK,
+    Gdk.KEY_Super_R: Gdk.ModifierType.SUPER_MASK,
+    Gdk.KEY_Meta_L: Gdk.ModifierType.META_MASK,
+    Gdk.KEY_Meta_R: Gdk.ModifierType.META_MASK,
+    Gdk.KEY_Control_L: Gdk.ModifierType.CONTROL_MASK,
+    Gdk.KEY_Control_R: Gdk.ModifierType.CONTROL_MASK,
+    Gdk.KEY_Shift_L: Gdk.ModifierType.SHIFT_MASK,
+    Gdk.KEY_Shift_R: Gdk.ModifierType.SHIFT_MASK,
+}
+
+MODIFIER_NAME_TO_KEY: dict[str, str] = {
+    "alt": "Alt_L",
+    "super": "Super_L",
+    "mod": "Super_L",
+    "shift": "Shift_L",
+    "control": "Control_L",
+    "ctrl": "Control_L",
+}
+
+
 def get_modifier_as_mask(modifier):
     """
     Returns the corresponding Gdk.ModifierType mask for a given modifier key.
@@ -116,18 +138,7 @@ def get_modifier_as_mask(modifier):
         Gdk.ModifierType: The modifier mask corresponding to the provided
             modifier key, or None if the key does not match any known modifier.
     """
-    if modifier in (Gdk.KEY_Alt_L, Gdk.KEY_Alt_R):
-        return Gdk.ModifierType.ALT_MASK
-    elif modifier in (Gdk.KEY_Super_L, Gdk.KEY_Super_R):
-        return Gdk.ModifierType.SUPER_MASK
-    elif modifier in (Gdk.KEY_Meta_L, Gdk.KEY_Meta_R):
-        return Gdk.ModifierType.META_MASK
-    elif modifier in (Gdk.KEY_Control_L, Gdk.KEY_Control_R):
-        return Gdk.ModifierType.CONTROL_MASK
-    elif modifier in (Gdk.KEY_Shift_L, Gdk.KEY_Shift_R):
-        return Gdk.ModifierType.SHIFT_MASK
-    else:
-        return None
+    return MODIFIER_KEY_TO_MASK.get(modifier)
 
 
 def parse_modifier_key(key):
@@ -146,15 +157,7 @@ def parse_modifier_key(key):
     Raises:
         ValueError: If the key is not a valid modifier.
     """
-    if key.lower() == "alt":
-        key = "Alt_L"
-    elif key.lower() in ("super", "mod"):
-        key = "Super_L"
-    elif key.lower() == "shift":
-        key = "Shift_L"
-    elif key.lower() == "control":
-        key = "Control_L"
-
+    key = MODIFIER_NAME_TO_KEY.get(key.lower(), key)
     modifier = Gdk.keyval_from_name(key)
     if modifier == Gdk.KEY_VoidSymbol:
         return None
@@ -212,14 +215,68 @@ def parse_accelerator_key(binding, default_modifier):
         raise ValueError(f"unable to parse keys: {binding}")
 
 
+def get_accelerator_key(section, key, default, modifier_mask):
+    """
+    Returns the key binding for `key` in a configuration section.
+
+    Bindings that are not overridden are derived from the `KeysConfig`
+    default, with the default modifier replaced by `modifier_mask`, instead
+    of parsing the default accelerator string.
+
+    Args:
+        section (dict): The configuration section.
+        key (str): The option to read.
+        default (tuple): The default (key, mods) binding from `KeysConfig`.
+        modifier_mask (int): The configured modifier mask.
+
+    Returns:
+        tuple: A tuple (key, mods) with the key value and modifier mask.
+    """
+    if key in section:
+        return parse_accelerator_key(section[key], modifier_mask)
+
+    keyval, mods = default
+    return (keyval, (mods & ~KeysConfig.modifier_mask) | modifier_mask)
+
+
+def get_bool(section, key, default):
+    """
+    Returns the boolean value of `key` in a configuration section.
+
+    TOML already decodes `true`/`false`, so any other value is a
+    configuration error and is replaced by the default.
+
+    Args:
+        section (dict): The configuration section.
+        key (str): The option to read.
+        default (bool): The value used if the option is missing or invalid.
+
+    Returns:
+        bool: The configured value or the default.
+    """
+    value = section.get(key, default)
+    if not isinstance(value, bool):
+        logger.warning("%s must be true or false, got %r", key, value)
+        return default
+    return value
+
+
+def get_config_dir() -> str:
+    """
+    Return the niriswitcher configuration directory.
+
+    An empty `XDG_CONFIG_HOME` is treated as unset.
+    """
+    config_home = os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config")
+    return os.path.join(config_home, "niriswitcher")
+
+
 def load_configuration(config_path: str = None) -> Config:
-    config_home = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
-    config_dir = os.path.join(config_home, "niriswitcher")
     if config_path is None:
-        config_path = os.path.join(config_dir, "config.toml")
+        config_path = os.path.join(get_config_dir(), "config.toml")
     if os.path.isfile(config_path):
         try:
-            with open(config_path, "rb") as f:
+            with open(config_path, "rb", buffering=0) as f:
                 config = tomllib.load(f)
         except tomllib.TOMLDecodeError as e:
             logger.warning(f"Error parsing config file {config_path!r}: {e}")
@@ -227,10 +284,13 @@ def load_configuration(config_path: str = None) -> Config:
     else:
         config = {}
 
-    separate_workspaces = config.get("separate_workspaces", True)
-    double_click_to_hide = config.get("double_click_to_hide", False)
-    center_on_focus = config.get("center_on_focus", False)
-    current_output_only = config.get("current_output_only", False)
+    separate_workspaces = get_bool(config, "separate_workspaces", True)
+    double_click_to_hide = get_bool(config, "double_click_to_hide", False)
+    center_on_focus = get_bool(config, "center_on_focus", False)
+    current_output_only = get_bool(config, "current_output_only", False)
+    disable_effects_when_software_rendered = get_bool(
+        config, "disable_effects_when_software_rendered", True
+    )
     log_level = config.get("log_level", "WARN")
     if log_level not in ("WARN", "INFO", "DEBUG", "ERROR"):
         log_level = "DEBUG"
@@ -240,14 +300,17 @@ def load_configuration(config_path: str = None) -> Config:
         double_click_to_hide=double_click_to_hide,
         center_on_focus=center_on_focus,
         current_output_only=current_output_only,
+        disable_effects_when_software_rendered=disable_effects_when_software_rendered,
         log_level=log_level,
     )
 
     workspace_section = config.get("workspace", {})
     workspace = WorkspaceConfig(
-        mru_sort_in_workspace=workspace_section.get("mru_sort_in_workspace", False),
-        mru_sort_across_workspace=workspace_section.get(
-            "mru_sort_across_workspace", True
+        mru_sort_in_workspace=get_bool(
+            workspace_section, "mru_sort_in_workspace", False
+        ),
+        mru_sort_across_workspace=get_bool(
+            workspace_section, "mru_sort_across_workspace", True
         ),
     )
 
@@ -259,22 +322,27 @@ def load_configuration(config_path: str = None) -> Config:
     window_section = keys_section.get("window", {})
     workspace_section = keys_section.get("workspace", {})
 
-    next_key = switch_section.get("next", "Tab")
-    prev_key = switch_section.get("prev", "Shift+Tab")
-    close_key = window_section.get("close", "q")
-    abort_key = window_section.get("abort", "Escape")
-    next_workspace_key = workspace_section.get("next", "grave")
-    prev_workspace_key = workspace_section.get("prev", "Shift+asciitilde")
-
     keys = KeysConfig(
         modifier=modifier,
         modifier_mask=modifier_mask,
-        next=parse_accelerator_key(next_key, modifier_mask),
-        prev=parse_accelerator_key(prev_key, modifier_mask),
-        close=parse_accelerator_key(close_key, modifier_mask),
-        abort=parse_accelerator_key(abort_key, modifier_mask),
-        next_workspace=parse_accelerator_key(next_workspace_key, modifier_mask),
-        prev_workspace=parse_accelerator_key(prev_workspace_key, modifier_mask),
+        next=get_accelerator_key(
+            switch_section, "next", KeysConfig.next, modifier_mask
+        ),
+        prev=get_accelerator_key(
+            switch_section, "prev", KeysConfig.prev, modifier_mask
+        ),
+        close=get_accelerator_key(
+            window_section, "close", KeysConfig.close, modifier_mask
+        ),
+        abort=get_accelerator_key(
+            window_section, "abort", KeysConfig.abort, modifier_mask
+        ),
+        next_workspace=get_accelerator_key(
+            workspace_section, "next", KeysConfig.next_workspace, modifier_mask
+        ),
+        prev_workspace=get_accelerator_key(
+            workspace_section, "prev", KeysConfig.prev_workspace, modifier_mask
+        ),
     )
 
     appearance_section = config.get("appearance", {})
@@ -361,34 +429,24 @@ def load_configuration(config_path: str = None) -> Config:
     )
 
 
-def load_system_style(filename="style.css", priority=0):
-    with (
-        importlib.resources.files("niriswitcher.resources")
-        .joinpath(filename)
-        .open("rb") as f
-    ):
+def load_system_style(filename="style.css"):
+    import importlib.resources
+
+    with importlib.resources.as_file(
+        importlib.resources.files("niriswitcher.resources").joinpath(filename)
+    ) as path:
         provider = Gtk.CssProvider()
-        css_data = f.read()
-        provider.load_from_data(css_data)
+        provider.load_from_path(str(path))
         return provider
 
 
 def load_user_style(filename="style.css"):
-    config_home = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
-    user_css_path = os.path.join(config_home, "niriswitcher", filename)
+    user_css_path = os.path.join(get_config_dir(), filename)
     if os.path.isfile(user_css_path):
-        with open(user_css_path, "rb") as f:
-            user_provider = Gtk.CssProvider()
-            css_data = f.read()
-            user_provider.load_from_data(css_data)
-            return user_provider
+        user_provider = Gtk.CssProvider()
+        user_provider.load_from_path(user_css_path)
+        return user_provider
     return None
 
 
-DEFAULT_CSS_PROVIDER = load_system_style(filename="style.css")
-DEFAULT_DARK_CSS_PROVIDER = load_system_style(filename="style-dark.css")
-
-DEFAULT_USER_CSS_PROVIDER = load_user_style(filename="style.css")
-DEFAULT_DARK_USER_CSS_PROVIDER = load_user_style(filename="style-dark.css")
-
 config: Config = load_configuration()
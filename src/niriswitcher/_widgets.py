@@ -1,5 +1,4 @@
 import logging
-import time
 
 from gi.repository import GLib, GObject, Gtk, Pango
 
@@ -29,48 +28,47 @@ class ApplicationView(Gtk.Box):
     __gsignals__ = {
         "enter": (GObject.SignalFlags.RUN_FIRST, None, (Window,)),
         "leave": (GObject.SignalFlags.RUN_FIRST, None, (Window,)),
-        "released": (
-            GObject.SignalFlags.RUN_FIRST,
-            None,
-            (Gtk.GestureClick, int, Window),
-        ),
     }
 
     def __init__(self, window: Window, *, size: int) -> None:
-        super().__init__(orientation=Gtk.Orientation.VERTICAL)
-        self.window = window
-        name = Gtk.Label()
-        name.set_ellipsize(Pango.EllipsizeMode.END)
-        name.set_max_width_chars(1)
-        name.set_hexpand(True)
-        if self.window.name:
-            name.set_label(self.window.name)
-
-        icon = Gtk.Image()
-        if self.window.icon is not None:
-            icon.set_from_gicon(self.window.icon)
-        icon.set_pixel_size(size)
-
-        self.append(icon)
-        self.append(name)
-
-        self.add_css_class("application")
-        name.add_css_class("application-name")
-        icon.add_css_class("application-icon")
-        self.set_urgent(window.is_urgent)
+        super().__init__(
+            orientation=Gtk.Orientation.VERTICAL, css_classes=["application"]
+        )
+        self.name_label = Gtk.Label(
+            ellipsize=Pango.EllipsizeMode.END,
+            max_width_chars=1,
+            single_line_mode=True,
+            hexpand=True,
+            css_classes=["application-name"],
+        )
+        self.icon_image = Gtk.Image(pixel_size=size, css_classes=["application-icon"])
+        self.append(self.icon_image)
+        self.append(self.name_label)
+        self.bind(window)
 
-        gesture = Gtk.GestureClick.new()
-        gesture.set_button(0)
-        gesture.connect("released", self.on_release)
         motion = Gtk.EventControllerMotion.new()
         motion.connect("enter", self.on_enter)
         motion.connect("leave", self.on_leave)
         self.connect("unmap", self.on_unmap)
         self.connect("map", self.on_map)
         self.add_controller(motion)
-        self.add_controller(gesture)
+
+    def bind(self, window: Window) -> None:
+        """
+        Display `window` in this view, replacing the previously shown window.
+
+        Must only be called while the view is detached from its parent.
+        """
+        self.window = window
+        self.name_label.set_label(window.name or "")
+        if window.icon is not None:
+            self.icon_image.set_from_gicon(window.icon)
+        else:
+            self.icon_image.clear()
+        self.set_urgent(window.is_urgent)
 
     def on_map(self, widget):
+        self.set_urgent(self.window.is_urgent)
         self._urgency_handler_id = self.window.connect(
             "notify::is-urgent", self.on_urgency_change
         )
@@ -81,11 +79,6 @@ class ApplicationView(Gtk.Box):
     def on_urgency_change(self, window, spec):
         self.set_urgent(window.get_property(spec.name))
 
-    def on_release(
-        self, gesture: Gtk.GestureClick, n_press: int, x: float, y: float
-    ) -> None:
-        self.emit("released", gesture, n_press, self.window)
-
     def on_enter(self, motion: Gtk.EventControllerMotion, x: float, y: float) -> None:
         self.emit("enter", self.window)
 
@@ -107,10 +100,59 @@ class ApplicationView(Gtk.Box):
     def focus(self) -> None:
         self.add_css_class("focused")
 
+    def clear_state(self) -> None:
+        """
+        Drop the selected and focused state with a single style update.
+        """
+        if self.window.is_urgent:
+            self.set_css_classes(["application", "urgent"])
+        else:
+            self.set_css_classes(["application"])
+
     def unfocus(self) -> None:
         self.remove_css_class("focused")
 
 
+class ApplicationViewCache:
+    """
+    Keeps ApplicationView widgets alive between showings of the switcher.
+
+    Views are keyed by window id. If the window object for an id has been
+    replaced, the detached view is rebound to the new object instead of
+    building a new widget tree. Views that were not requested since the
+    previous call to `prune` are dropped.
+    """
+
+    __slots__ = ("_views", "_used")
+
+    def __init__(self):
+        self._views: dict[int, ApplicationView] = {}
+        self._used: set[int] = set()
+
+    def get(self, window: Window, *, size: int) -> ApplicationView:
+        application_view = self._views.get(window.id)
+        if application_view is None or application_view.get_parent() is not None:
+            application_view = ApplicationView(window, size=size)
+            self._views[window.id] = application_view
+        elif application_view.window is not window:
+            application_view.bind(window)
+        self._used.add(window.id)
+        return application_view
+
+    def add(self, application_view: ApplicationView) -> None:
+        window_id = application_view.window.id
+        self._views[window_id] = application_view
+        self._used.add(window_id)
+
+    def prune(self):
+        self._views = {
+            window_id: application_view
+            for window_id, application_view in self._views.items()
+            if window_id in self._used
+        }
+        self._used.clear()
+
+
 class AnimateScrollToWidget:
     """
     Animates scrolling of a Gtk.ScrolledWindow to bring a specified widget into
@@ -123,7 +165,8 @@ class AnimateScrollToWidget:
 
     Attributes:
         scrolled_window (Gtk.ScrolledWindow): The scrolled window to animate.
-        _timer_id (int or None): The identifier for the active GLib timeout, if any.
+        _tick_id (int or None): The identifier for the active tick callback, if any.
+        _idle_id (int or None): The identifier for the pending idle callback, if any.
 
     Example:
         animator = AnimateScrollToWidget(scrolled_window)
@@ -131,131 +174,131 @@ class AnimateScrollToWidget:
 
     """
 
+    __slots__ = (
+        "_tick_id",
+        "_idle_id",
+        "_target",
+        "_set_value",
+        "_easing",
+        "_start_value",
+        "_delta",
+        "_new_value",
+        "_start_time",
+        "_inv_duration",
+        "duration",
+        "easing",
+    )
+
     def __init__(self, *, duration=200, easing=None):
-        self._timer_id = None
+        self._tick_id = None
+        self._idle_id = None
+        self._target = None
+        # State of the running animation, read by _animate on every frame
+        self._set_value = None
+        self._easing = None
+        self._start_value = 0.0
+        self._delta = 0.0
+        self._new_value = 0.0
+        self._start_time = None
+        self._inv_duration = 0.0
         self.duration = duration
         self.easing = easing
 
     def __call__(self, scrolled_window, widget):
-        easing = self.easing
-        if easing is None:
-            easing = ease_in_out_cubic
-
-        def animate_scroll_to_application():
-            hadj = scrolled_window.get_hadjustment()
-            child_x = widget.get_allocation().x
-            child_width = widget.get_allocation().width
-            visible_start = hadj.get_value()
-            visible_end = visible_start + hadj.get_page_size()
-            if child_x >= visible_start and (child_x + child_width) <= visible_end:
+        if self._idle_id is None:
+            # Nothing to do if the widget is already allocated and in view
+            if self._is_in_view(scrolled_window, widget):
                 return
 
-            child_center = child_x + child_width / 2
-            new_value = child_center - hadj.get_page_size() / 2
-
-            new_value = max(
-                hadj.get_lower(),
-                min(new_value, hadj.get_upper() - hadj.get_page_size()),
-            )
-
-            if self.duration == 0:
-                hadj.set_value(new_value)
-                self._timer_id = None
+            # Without animation an allocated widget can be scrolled to right
+            # away, without a round trip through the main loop
+            if self.duration == 0 and widget.get_allocation().width > 0:
+                self._scroll_to(scrolled_window, widget)
                 return
 
-            start_value = hadj.get_value()
-            delta = new_value - start_value
-            start_time = time.monotonic()
-
-            def animate_scroll():
-                elapsed = (time.monotonic() - start_time) * 1000
-                t = min(elapsed / self.duration, 1.0)
-                eased_t = easing(t)
-                current_value = start_value + delta * eased_t
-                hadj.set_value(current_value)
-                if t < 1.0:
-                    return True
-                else:
-                    self._timer_id = None
-                    hadj.set_value(new_value)
-                    return False
-
-            if self._timer_id is not None:
-                GLib.source_remove(self._timer_id)
-                self._timer_id = None
-
-            self._timer_id = GLib.timeout_add(16, animate_scroll)
-
-        GLib.idle_add(animate_scroll_to_application)
-
-
-class WidgetPropertyAnimation:
-    def __init__(
-        self, method, *, before, setter, initial, target, duration=200, easing=None
-    ):
-        self._timer_id = None
-        self.initial = initial
-        self.target = target
-        self._current = None
-        self.method = method
-        self.setter = setter
-        self.before = before
-        self.duration = duration
-        self.easing = easing
-
-    def __call__(self, *args, **kwargs):
-        before = self.before(*args, **kwargs)
-        if hasattr(self.duration, "__call__"):
-            duration = self.duration(*args, **kwargs)
-        else:
-            duration = self.duration
+        # Only the most recent target matters, so rapid selection changes
+        # (e.g., holding Tab) share a single pending idle callback.
+        self._target = widget
+        if self._idle_id is None:
+            self._idle_id = GLib.idle_add(self._scroll_to_target, scrolled_window)
+
+    @staticmethod
+    def _is_in_view(scrolled_window, widget):
+        allocation = widget.get_allocation()
+        if allocation.width <= 0:
+            return False
+
+        hadj = scrolled_window.get_hadjustment()
+        visible_start = hadj.get_value()
+        visible_end = visible_start + hadj.get_page_size()
+        return (
+            allocation.x >= visible_start
+            and allocation.x + allocation.width <= visible_end
+        )
 
-        if not before:
-            initial, target = self.target, self.initial
-        else:
-            initial = self.initial
-            target = self.target
+    def _scroll_to_target(self, scrolled_window):
+        self._idle_id = None
+        widget = self._target
+        self._target = None
+        if widget is not None:
+            self._scroll_to(scrolled_window, widget)
+        return GLib.SOURCE_REMOVE
 
-        self._current = initial
+    def _scroll_to(self, scrolled_window, widget):
         easing = self.easing
         if easing is None:
-            easing = ease_out_cubic
+            easing = ease_in_out_cubic
 
-        if duration == 0:
-            self.setter(target)
-            self.method(*args, **kwargs)
+        hadj = scrolled_window.get_hadjustment()
+        allocation = widget.get_allocation()
+        child_x = allocation.x
+        child_width = allocation.width
+        page_size = hadj.get_page_size()
+        visible_start = hadj.get_value()
+        visible_end = visible_start + page_size
+        if child_x >= visible_start and (child_x + child_width) <= visible_end:
             return
 
-        if before:
-            self.setter(initial)
-            self.method(*args, **kwargs)
+        child_center = child_x + child_width / 2
+        new_value = child_center - page_size / 2
 
-        def idle_add():
-            delta = target - initial
-            start_time = time.monotonic()
-
-            def do_animation():
-                elapsed = (time.monotonic() - start_time) * 1000
-                t = min(elapsed / duration, 1.0)
-                eased_t = easing(t)
-                self._current = initial + delta * eased_t
-                if t < 1.0:
-                    self.setter(self._current)
-                    return True
-                else:
-                    self._timer_id = None
-                    self._current = None
-                    self.setter(target)
-                    if not before:
-                        self.method(*args, **kwargs)
-                    return False
+        new_value = max(
+            hadj.get_lower(),
+            min(new_value, hadj.get_upper() - page_size),
+        )
 
-            if self._timer_id is not None:
-                GLib.source_remove(self._timer_id)
+        if self._tick_id is not None:
+            scrolled_window.remove_tick_callback(self._tick_id)
+            self._tick_id = None
 
-            self._timer_id = GLib.timeout_add(16, do_animation)
+        if self.duration == 0:
+            hadj.set_value(new_value)
+            return
 
-        GLib.idle_add(idle_add)
+        self._set_value = hadj.set_value
+        self._easing = easing
+        self._start_value = visible_start
+        self._delta = new_value - visible_start
+        self._new_value = new_value
+        # Frame clock timestamps are in microseconds; the animation starts
+        # at the time of the first frame it is drawn in
+        self._inv_duration = 1 / (self.duration * 1000)
+        self._start_time = None
+        self._tick_id = scrolled_window.add_tick_callback(self._animate)
+
+    def _animate(self, scrolled_window, frame_clock):
+        frame_time = frame_clock.get_frame_time()
+        if self._start_time is None:
+            self._start_time = frame_time
+        t = (frame_time - self._start_time) * self._inv_duration
+        if t < 1.0:
+            self._set_value(self._start_value + self._delta * self._easing(t))
+            return GLib.SOURCE_CONTINUE
+
+        self._tick_id = None
+        self._set_value(self._new_value)
+        self._set_value = None
+        return GLib.SOURCE_REMOVE
 
 
 class SizeTransition:
@@ -266,55 +309,86 @@ class SizeTransition:
     updating the size incrementally and triggering widget redraws as needed.
 
     Attributes:
-        _timer_id (int or None): ID of the active GLib timeout source, or None if no animation is running.
+        _tick_id (int or None): ID of the tick callback driving the animation,
+            or None if no animation is running.
+        _widget: The widget the tick callback is attached to.
         current_size (float or None): The current interpolated size during the transition, or None when idle.
-        widget: The widget instance whose size is being animated.
 
     Example:
         transition = SizeTransition(widget)
         transition(initial_size=100, target_size=200, duration=300)
     """
 
+    __slots__ = (
+        "_tick_id",
+        "_widget",
+        "_easing",
+        "_initial_size",
+        "_delta",
+        "_start_time",
+        "_inv_duration",
+        "current_size",
+        "duration",
+        "easing",
+    )
+
     def __init__(self, *, duration=200, easing=None):
-        self._timer_id = None
+        self._tick_id = None
+        self._widget = None
+        # State of the running animation, read by _animate on every frame
+        self._easing = None
+        self._initial_size = 0
+        self._delta = 0
+        self._start_time = None
+        self._inv_duration = 0.0
         self.current_size = None
         self.duration = duration
         self.easing = easing
 
     def __call__(self, widget, initial_size, target_size):
-        self.current_size = initial_size
-        easing = self.easing
-        if easing is None:
-            easing = ease_out_cubic
-
         if self.duration == 0:
-            self.current_size = target_size
+            # Nothing to interpolate; let the widget measure its new size
+            self.current_size = None
+            widget.queue_resize()
             return
 
-        def idle_add():
-            delta = target_size - initial_size
-            start_time = time.monotonic()
+        self.current_size = initial_size
 
-            def do_animation():
-                elapsed = (time.monotonic() - start_time) * 1000
-                t = min(elapsed / self.duration, 1.0)
-                eased_t = easing(t)
-                self.current_size = initial_size + delta * eased_t
-                if t < 1.0:
-                    widget.queue_resize()
-                    return True
-                else:
-                    self._timer_id = None
-                    self.current_size = None
-                    widget.queue_resize()
-                    return False
+        GLib.idle_add(self._start, widget, initial_size, target_size)
 
-            if self._timer_id is not None:
-                GLib.source_remove(self._timer_id)
+    def _start(self, widget, initial_size, target_size):
+        if self._tick_id is not None:
+            self._widget.remove_tick_callback(self._tick_id)
 
-            self._timer_id = GLib.timeout_add(16, do_animation)
+        easing = self.easing
+        if easing is None:
+            easing = ease_out_cubic
 
-        GLib.idle_add(idle_add)
+        self._widget = widget
+        self._easing = easing
+        self._initial_size = initial_size
+        self._delta = target_size - initial_size
+        # Frame clock timestamps are in microseconds; the animation starts
+        # at the time of the first frame it is drawn in
+        self._inv_duration = 1 / (self.duration * 1000)
+        self._start_time = None
+        self._tick_id = widget.add_tick_callback(self._animate)
+        return GLib.SOURCE_REMOVE
+
+    def _animate(self, widget, frame_clock):
+        frame_time = frame_clock.get_frame_time()
+        if self._start_time is None:
+            self._start_time = frame_time
+        t = (frame_time - self._start_time) * self._inv_duration
+        if t < 1.0:
+            self.current_size = self._initial_size + self._delta * self._easing(t)
+            widget.queue_resize()
+            return GLib.SOURCE_CONTINUE
+
+        self._tick_id = None
+        self.current_size = None
+        widget.queue_resize()
+        return GLib.SOURCE_REMOVE
 
 
 class WorkspaceView(Gtk.ScrolledWindow):
@@ -325,7 +399,15 @@ class WorkspaceView(Gtk.ScrolledWindow):
     }
 
     def __init__(
-        self, workspace, windows, *, min_width=600, max_width=800, icon_size=128
+        self,
+        workspace,
+        windows,
+        *,
+        min_width=600,
+        max_width=800,
+        icon_size=128,
+        view_cache=None,
+        lazy=False,
     ):
         super().__init__()
         self.application_views = Gtk.Box(
@@ -339,16 +421,38 @@ class WorkspaceView(Gtk.ScrolledWindow):
         self.application_views.set_homogeneous(True)
         self.set_policy(Gtk.PolicyType.AUTOMATIC, Gtk.PolicyType.NEVER)
         self.set_halign(Gtk.Align.CENTER)
-        self.set_child(self.application_views)
-        for window in windows:
-            application_view = ApplicationView(window, size=icon_size)
-            application_view.connect("enter", self.on_enter)
-            application_view.connect("leave", self.on_leave)
-            application_view.connect("released", self.on_released)
-            self.application_views.append(application_view)
+        # Mirrors the children of the box, to iterate without walking the
+        # widget tree through GObject
+        self._children: list[ApplicationView] = []
+        self._by_window_id: dict[int, ApplicationView] = {}
+        self._handler_ids: dict[ApplicationView, tuple[int, int]] = {}
+        self._focused_application = None
+        self.icon_size = icon_size
+        self.view_cache = view_cache
+        # Windows of a lazy view whose application views are not built yet;
+        # they are built by populate() the first time the view is selected
+        self._pending_windows = None
+        if lazy:
+            self._pending_windows = list(windows)
+        else:
+            for window in windows:
+                application_view = self._attach_application_view(window)
+                self.application_views.append(application_view)
+                self._children.append(application_view)
+
+        # A single click gesture for the whole box; the clicked application
+        # is resolved by picking the widget under the pointer.
+        gesture = Gtk.GestureClick.new()
+        gesture.set_button(0)
+        gesture.connect("released", self.on_released)
+        self.application_views.add_controller(gesture)
 
+        # Attach the box only once it is fully populated so that the
+        # scrolled window performs a single layout pass for all children.
+        self.set_child(self.application_views)
         self.max_width = max_width
         self.min_width = min_width
+        self._natural_width = None
         self.size_transition = SizeTransition()
         self._scroll_to = AnimateScrollToWidget()
         self.current_application = self.get_initial_selection()
@@ -362,7 +466,12 @@ class WorkspaceView(Gtk.ScrolledWindow):
         self.min_width = min_width
         self.queue_resize()
 
-    def on_released(self, widget, gesture, n_press, window):
+    def on_released(self, gesture, n_press, x, y):
+        application_view = self.pick_application_view(x, y)
+        if application_view is None:
+            return
+
+        window = application_view.window
         hide = True
         if config.general.double_click_to_hide:
             hide = n_press > 1
@@ -385,14 +494,116 @@ class WorkspaceView(Gtk.ScrolledWindow):
         if self.current_application is not None:
             self.emit("selection-changed", self.current_application.window)
 
+    def _attach_application_view(self, window):
+        if self.view_cache is not None:
+            application_view = self.view_cache.get(window, size=self.icon_size)
+        else:
+            application_view = ApplicationView(window, size=self.icon_size)
+        self._handler_ids[application_view] = (
+            application_view.connect("enter", self.on_enter),
+            application_view.connect("leave", self.on_leave),
+        )
+        self._by_window_id[window.id] = application_view
+        return application_view
+
+    def _detach_application_view(self, application_view):
+        for handler_id in self._handler_ids.pop(application_view, ()):
+            application_view.disconnect(handler_id)
+        application_view.clear_state()
+        self.application_views.remove(application_view)
+
+    def populate(self):
+        """
+        Build the application views of a lazy view, if not done already.
+        """
+        windows = self._pending_windows
+        if windows is None:
+            return
+
+        self._pending_windows = None
+        self.sync(windows)
+        if self.current_application is None:
+            self.current_application = self.get_initial_selection()
+
+    def sync(self, windows):
+        """
+        Update the view to show `windows` in the given order.
+
+        Application views of windows that are still present are moved into
+        place; views of windows that are gone are detached, and views are
+        only created for new windows.
+        """
+        if self._pending_windows is not None:
+            self._pending_windows = list(windows)
+            return
+
+        wanted = {window.id: window for window in windows}
+        kept = {}
+        for application_view in self._children:
+            window = application_view.window
+            if wanted.get(window.id) is window:
+                kept[window.id] = application_view
+            else:
+                self._detach_application_view(application_view)
+
+        self._by_window_id = {}
+        children = []
+        previous = None
+        for window in windows:
+            application_view = kept.get(window.id)
+            if application_view is None:
+                application_view = self._attach_application_view(window)
+                self.application_views.insert_child_after(application_view, previous)
+            else:
+                self._by_window_id[window.id] = application_view
+                self.application_views.reorder_child_after(application_view, previous)
+            children.append(application_view)
+            previous = application_view
+
+        self._children = children
+        self._natural_width = None
+
+    def release_applications(self):
+        """
+        Detach all application views so that they can be reused by another
+        WorkspaceView.
+        """
+        self._pending_windows = None
+        for application_view in self._children:
+            self._detach_application_view(application_view)
+        self._children.clear()
+        self._by_window_id.clear()
+        self._focused_application = None
+        self.current_application = None
+
+    def reset(self):
+        """
+        Restore the initial selection so that the view can be shown again.
+        """
+        if self.current_application is not None:
+            self.current_application.deselect()
+        if self._focused_application is not None:
+            self._focused_application.unfocus()
+            self._focused_application = None
+        self.current_application = self.get_initial_selection()
+        self.get_hadjustment().set_value(0)
+
+    def pick_application_view(self, x, y):
+        widget = self.application_views.pick(x, y, Gtk.PickFlags.DEFAULT)
+        while widget is not None and widget is not self.application_views:
+            if isinstance(widget, ApplicationView):
+                return widget
+            widget = widget.get_parent()
+        return None
+
     def get_first_application_view(self):
-        return self.application_views.get_first_child()
+        return self._children[0] if self._children else None
 
     def get_last_application_view(self):
-        return self.application_views.get_last_child()
+        return self._children[-1] if self._children else None
 
     def is_empty(self):
-        return self.application_views.get_first_child() is None
+        return not self._children and not self._pending_windows
 
     def set_scroll_duration(self, scroll_duration):
         self._scroll_to.duration = scroll_duration
@@ -421,21 +632,31 @@ class WorkspaceView(Gtk.ScrolledWindow):
             self.emit("close-requested", self.current_application.window)
 
     def select_current(self):
+        self.populate()
         self.select(self.current_application)
 
     def select(self, application):
         if application is None:
             return
 
-        if self.current_application is not None:
-            self.current_application.deselect()
+        if application is not self.current_application:
+            if self.current_application is not None:
+                self.current_application.deselect()
+            self.current_application = application
 
-        self.current_application = application
         self.current_application.select()
         self.scroll_to(self.current_application)
         self.emit("selection-changed", self.current_application.window)
 
     def select_next(self):
+        # With a single application there is nothing to cycle to; skip the
+        # sibling walk but still (re)apply the selection, since callers rely
+        # on this to select the initial application
+        self.populate()
+        if len(self._children) <= 1:
+            self.select_current()
+            return
+
         next = self.current_application.get_next_sibling()
         if next is None:
             next = self.application_views.get_first_child()
@@ -443,30 +664,68 @@ class WorkspaceView(Gtk.ScrolledWindow):
         self.select(next)
 
     def select_prev(self):
+        self.populate()
+        if len(self._children) <= 1:
+            self.select_current()
+            return
+
         prev = self.current_application.get_prev_sibling()
         if prev is None:
             prev = self.application_views.get_last_child()
 
         self.select(prev)
 
+    def focus_window(self, window_id):
+        """
+        Mark the view of `window_id` as focused and scroll it into view.
+        """
+        application_view = self._by_window_id.get(window_id)
+        if application_view is self._focused_application:
+            return
+
+        if self._focused_application is not None:
+            self._focused_application.unfocus()
+        self._focused_application = application_view
+
+        if application_view is not None:
+            application_view.focus()
+            self.scroll_to(application_view)
+
     def remove_by_window_id(self, window_id):
-        if any((current := av).window.id == window_id for av in self):
-            self.remove_application(current)
-            return True
+        pending = self._pending_windows
+        if pending is not None:
+            windows = [window for window in pending if window.id != window_id]
+            self._pending_windows = windows
+            return len(windows) != len(pending)
+
+        application_view = self._by_window_id.get(window_id)
+        if application_view is None:
+            return False
 
-        return False
+        self.remove_application(application_view)
+        return True
 
     def remove_application(self, application):
-        before = self.application_views.measure(Gtk.Orientation.HORIZONTAL, -1)
+        before = self._natural_width
+        if before is None:
+            before = self.application_views.measure(
+                Gtk.Orientation.HORIZONTAL, -1
+            ).natural
+
         if application == self.current_application:
             self.select_prev()
 
-        self.application_views.remove(application)
-        after = self.application_views.measure(Gtk.Orientation.HORIZONTAL, -1)
+        self._detach_application_view(application)
+        self._children.remove(application)
+        del self._by_window_id[application.window.id]
+        if application is self._focused_application:
+            self._focused_application = None
+        after = self.application_views.measure(Gtk.Orientation.HORIZONTAL, -1).natural
+        self._natural_width = after
         self.size_transition(
             self,
-            max(self.min_width, min(self.max_width, before.natural)),
-            max(self.min_width, min(self.max_width, after.natural)),
+            max(self.min_width, min(self.max_width, before)),
+            max(self.min_width, min(self.max_width, after)),
         )
 
     def do_measure(self, orientation, for_size):
@@ -474,10 +733,8 @@ class WorkspaceView(Gtk.ScrolledWindow):
         min_size = measure.minimum
         nat_size = measure.natural
         if orientation == Gtk.Orientation.HORIZONTAL:
-            if self.max_width is None:
-                min_size = min_size
-                nat_size = nat_size
-            else:
+            self._natural_width = nat_size
+            if self.max_width is not None:
                 min_size = min(self.max_width, min_size)
                 nat_size = min(self.max_width, nat_size)
             if self.size_transition.current_size is not None:
@@ -486,10 +743,7 @@ class WorkspaceView(Gtk.ScrolledWindow):
         return (min_size, nat_size, -1, -1)
 
     def __iter__(self):
-        current = self.application_views.get_first_child()
-        while current is not None:
-            yield current
-            current = current.get_next_sibling()
+        return iter(self._children)
 
 
 class WorkspaceIndicatorChild(Gtk.Box):
@@ -507,23 +761,12 @@ class WorkspaceIndicatorChild(Gtk.Box):
         width (int, optional): The width of the indicator. Defaults to 5.
     """
 
-    __gsignals__ = {
-        "pressed": (GObject.SignalFlags.RUN_FIRST, None, (Workspace,)),
-    }
-
     def __init__(self, workspace, width=5):
         super().__init__()
         self.workspace = workspace
         self.set_size_request(width, -1)
         self.add_css_class("workspace-indicator")
         self.set_vexpand(True)
-        gesture = Gtk.GestureClick.new()
-        gesture.set_button(0)
-        gesture.connect("pressed", self.on_pressed)
-        self.add_controller(gesture)
-
-    def on_pressed(self, gesture, n_press, x, y):
-        self.emit("pressed", self.workspace)
 
     def select(self):
         self.add_css_class("selected")
@@ -544,21 +787,36 @@ class WorkspaceIndicator(Gtk.Box):
         self.set_vexpand(True)
         self.set_name("workspace-indicators")
         self.current = None
+        self._by_workspace_id = {}
+
+        # One gesture for all indicators; the pressed indicator is resolved
+        # by picking the widget under the pointer.
+        gesture = Gtk.GestureClick.new()
+        gesture.set_button(0)
+        gesture.connect("pressed", self.on_pressed)
+        self.add_controller(gesture)
 
     def append_workspace(self, workspace: Workspace):
         workspace_indicator = WorkspaceIndicatorChild(workspace, self.width)
-        workspace_indicator.connect("pressed", self.on_pressed)
         self.append(workspace_indicator)
+        self._by_workspace_id[workspace.id] = workspace_indicator
 
-    def on_pressed(self, widget, workspace):
-        self.select_by_workspace_id(workspace.id)
-        self.emit("selection-changed", workspace, False)
+    def clear(self):
+        while (child := self.get_first_child()) is not None:
+            self.remove(child)
+        self._by_workspace_id.clear()
+        self.current = None
+
+    def on_pressed(self, gesture, n_press, x, y):
+        indicator = self.pick(x, y, Gtk.PickFlags.DEFAULT)
+        if not isinstance(indicator, WorkspaceIndicatorChild):
+            return
+
+        self.select(indicator)
+        self.emit("selection-changed", indicator.workspace, False)
 
     def select_by_workspace_id(self, workspace_id, animate=True):
-        for current in self:
-            if current.workspace.id == workspace_id:
-                self.select(current, animate=animate)
-                break
+        self.select(self._by_workspace_id.get(workspace_id), animate=animate)
 
     def select(self, indicator, animate=True):
         if indicator is None or indicator is self.current:
@@ -586,10 +844,9 @@ class WorkspaceIndicator(Gtk.Box):
         self.select(prev, animate=animate)
 
     def __iter__(self):
-        current = self.get_first_child()
-        while current is not None:
-            yield current
-            current = current.get_next_sibling()
+        # Indicators are only added through append_workspace, so the index
+        # holds them in child order
+        return iter(self._by_workspace_id.values())
 
 
 class WorkspaceStack(Gtk.Stack):
@@ -603,6 +860,7 @@ class WorkspaceStack(Gtk.Stack):
         self.min_width = min_width
         self.connect("notify::visible-child", self._on_visible_child)
         self.indicator: WorkspaceIndicator = None
+        self._by_identifier: dict[str, WorkspaceView] = {}
 
     def set_width(self, min_width, max_width):
         self.min_width = min_width
@@ -610,9 +868,8 @@ class WorkspaceStack(Gtk.Stack):
         self.get_visible_child().set_width(self.min_width, self.max_width)
 
     def set_indicator(self, indicator):
-        for indicator_child in list(indicator):
-            indicator.remove(indicator_child)
-        for workspace_view in list(self):
+        indicator.clear()
+        for workspace_view in self:
             indicator.append_workspace(workspace_view.workspace)
 
         self.indicator = indicator
@@ -621,13 +878,25 @@ class WorkspaceStack(Gtk.Stack):
     def add_workspace(self, workspace_view):
         if self.indicator:
             self.indicator.append_workspace(workspace_view.workspace)
-        self.add_named(workspace_view, workspace_view.workspace.identifier)
+        self.add_view(workspace_view, workspace_view.workspace.identifier)
+
+    def add_view(self, workspace_view, identifier):
+        self.add_named(workspace_view, identifier)
+        self._by_identifier[identifier] = workspace_view
+
+    def get_workspace_view(self, identifier):
+        return self._by_identifier.get(identifier)
+
+    def clear(self):
+        while (child := self.get_first_child()) is not None:
+            self.remove(child)
+        self._by_identifier.clear()
 
     def _on_visible_child(self, widget, prop):
         self.get_visible_child().set_width(self.min_width, self.max_width)
 
     def on_selection_changed(self, widget, workspace, animate):
-        workspace_view = self.get_child_by_name(workspace.identifier)
+        workspace_view = self._by_identifier.get(workspace.identifier)
         if workspace_view is not None:
             if animate:
                 self.set_visible_child(workspace_view)
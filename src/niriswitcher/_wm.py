@@ -1,40 +1,71 @@
 import json
 import operator
 import os
-import socket
-import time
+from collections import OrderedDict
+import itertools
 
 from gi.repository import Gio, GObject, GLib, Gtk, Gdk
 
 import logging
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Focus "times" only need to be ordered, so a counter replaces the wall clock
+_focus_counter = itertools.count(1)
+_APP_INFO_CACHE: dict[str, Gio.AppInfo] = {}
+_ICON_CACHE: dict[str | None, Gio.Icon | None] = {}
+_FALLBACK_ICON = Gio.ThemedIcon.new("application-x-executable")
+_icon_theme: Gtk.IconTheme | None = None
+_app_info_monitor: Gio.AppInfoMonitor | None = None
+
+
+def next_focus_time() -> int:
+    return next(_focus_counter)
+
+
+def get_icon_theme() -> Gtk.IconTheme:
+    """
+    Return the icon theme of the default display.
+
+    Resolved icons are cached, so the cache is cleared whenever the theme
+    changes.
+    """
+    global _icon_theme
+    if _icon_theme is None:
+        _icon_theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
+        _icon_theme.connect("changed", lambda icon_theme: _ICON_CACHE.clear())
+    return _icon_theme
+
 
 def find_icon(app_info: Gio.DesktopAppInfo) -> Gio.Icon | None:
+    key = app_info.get_id() if app_info else None
+    if key not in _ICON_CACHE:
+        _ICON_CACHE[key] = _lookup_icon(app_info)
+    return _ICON_CACHE[key]
+
+
+def _lookup_icon(app_info: Gio.DesktopAppInfo) -> Gio.Icon | None:
     app_name = "unknown-application"
-    icon_theme = Gtk.IconTheme.get_for_display(Gdk.Display.get_default())
     if app_info:
         app_name = app_info.get_name()
         icon = app_info.get_icon()
         if isinstance(icon, Gio.ThemedIcon):
-            icon_names = icon.get_names()
-            for icon_name in icon_names:
-                if icon_theme.has_icon(icon_name):
-                    try:
-                        return icon
-                    except Exception:
-                        continue
+            # Let GTK resolve the names in a single lookup, falling back to
+            # the generic executable icon if none of them are themed.
+            return Gio.ThemedIcon.new_from_names(
+                [*icon.get_names(), "application-x-executable"]
+            )
         elif isinstance(icon, Gio.LoadableIcon):
-            try:
-                return icon
-            except Exception:
-                pass
+            return icon
 
-    if icon_theme.has_icon("application-x-executable"):
+    if get_icon_theme().has_icon("application-x-executable"):
         logger.debug("Can't find icon for %s, using default fallback", app_name)
-        icon = Gio.ThemedIcon.new("application-x-executable")
-        return icon
+        return _FALLBACK_ICON
 
     logger.error("Can't find icon for %s", app_name)
     return None
@@ -47,11 +78,10 @@ class Window(GObject.Object):
     app_info = GObject.Property(type=Gio.DesktopAppInfo)
     title = GObject.Property(type=str)
     is_urgent = GObject.Property(type=bool, default=False)
-    last_focus_time = GObject.Property(type=float)
     icon = GObject.Property(type=Gio.Icon)
     name = GObject.Property(type=str)
 
-    def __init__(self, window, last_focus_time=None):
+    def __init__(self, window):
         app_id = window["app_id"]
         workspace_id = window["workspace_id"]
         app_info = get_app_info(app_id) if app_id is not None else None
@@ -65,15 +95,11 @@ class Window(GObject.Object):
             app_id=app_id,
             name=name,
             icon=find_icon(app_info),
-            app_info=get_app_info(app_id) if app_id is not None else None,
+            app_info=app_info,
             title=window["title"],
-            last_focus_time=(
-                last_focus_time if last_focus_time is not None else time.time()
-            ),
         )
 
     def update(self, new):
-        self.last_focus_time = time.time()
         if title := new.get("title"):
             if self.title != title:
                 self.title = title
@@ -86,8 +112,13 @@ class Window(GObject.Object):
     def center(self):
         niri_request({"Action": {"CenterWindow": {"id": int(self.id)}}})
 
-    def focus(self):
-        niri_request({"Action": {"FocusWindow": {"id": int(self.id)}}})
+    def focus(self, center=False):
+        focus = {"Action": {"FocusWindow": {"id": int(self.id)}}}
+        if center:
+            # Centering must reach niri after the focus change
+            niri_request(focus, {"Action": {"CenterWindow": {"id": int(self.id)}}})
+        else:
+            niri_request(focus)
 
     def close(self):
         niri_request({"Action": {"CloseWindow": {"id": int(self.id)}}})
@@ -121,12 +152,12 @@ class Workspace(GObject.Object):
             is_active=workspace["is_active"],
             is_focused=workspace["is_focused"],
             last_focus_time=(
-                last_focus_time if last_focus_time is not None else time.time()
+                last_focus_time if last_focus_time is not None else next_focus_time()
             ),
         )
 
     def update(self, new):
-        self.last_focus_time = time.time()
+        self.last_focus_time = next_focus_time()
         if output := new.get("output"):
             if self.output != output:
                 self.output = output
@@ -144,7 +175,37 @@ class Workspace(GObject.Object):
                 self.idx = idx
 
 
+def get_app_info_monitor() -> Gio.AppInfoMonitor:
+    """
+    Return the monitor for installed desktop files.
+
+    Resolved application infos and their icons are cached, so both caches
+    are cleared whenever a desktop file is added, removed or changed.
+    """
+    global _app_info_monitor
+    if _app_info_monitor is None:
+        _app_info_monitor = Gio.AppInfoMonitor.get()
+        _app_info_monitor.connect("changed", lambda monitor: _clear_app_info_cache())
+    return _app_info_monitor
+
+
+def _clear_app_info_cache():
+    _APP_INFO_CACHE.clear()
+    _ICON_CACHE.clear()
+
+
 def get_app_info(app_id: str) -> Gio.AppInfo | None:
+    get_app_info_monitor()
+    app_info = _APP_INFO_CACHE.get(app_id)
+    if app_info is None:
+        # Misses are not cached so a desktop file installed later is found
+        app_info = _lookup_app_info(app_id)
+        if app_info is not None:
+            _APP_INFO_CACHE[app_id] = app_info
+    return app_info
+
+
+def _lookup_app_info(app_id: str) -> Gio.AppInfo | None:
     try:
         return Gio.DesktopAppInfo.new(app_id + ".desktop")
     except Exception:
@@ -167,20 +228,46 @@ def get_app_info_fallback(app_id: str) -> Gio.AppInfo | None:
         return None
 
 
-def connect_niri_socket():
-    niri_socket = socket.socket(socket.AF_UNIX)
-    niri_socket.connect(os.environ.get("NIRI_SOCKET"))
-    return niri_socket
+def niri_request(request, *then):
+    """
+    Send a request to niri without waiting for the reply.
 
+    The connection is established asynchronously and the reply is read (and
+    discarded) from the main loop, so the caller is never blocked by niri.
+    The requests in `then` are sent one by one, each after niri has replied
+    to the previous one, so that niri handles them in order.
+    """
+    address = Gio.UnixSocketAddress.new(os.environ.get("NIRI_SOCKET"))
+    client = Gio.SocketClient.new()
+    payload = json.dumps(request).encode() + b"\n"
+    client.connect_async(address, None, _on_niri_request_connected, (payload, then))
 
-def niri_request(request):
-    with connect_niri_socket() as niri_socket:
-        with niri_socket.makefile("rw") as socket_file:
-            socket_file.write(json.dumps(request))
-            socket_file.write("\n")
-            socket_file.flush()
-            niri_socket.shutdown(socket.SHUT_WR)
-            socket_file.readline()  # Avoid broken pipe in niri
+
+def _on_niri_request_connected(client, result, data):
+    payload, then = data
+    try:
+        connection = client.connect_finish(result)
+        connection.get_output_stream().write_all(payload, None)
+        connection.get_socket().shutdown(False, True)
+        input_stream = Gio.DataInputStream.new(connection.get_input_stream())
+        input_stream.read_line_async(
+            GLib.PRIORITY_DEFAULT, None, _on_niri_reply_read, (connection, then)
+        )
+    except GLib.Error:
+        logger.error("Failed to send request to niri", exc_info=True)
+
+
+def _on_niri_reply_read(stream, result, data):
+    connection, then = data
+    try:
+        stream.read_line_finish(result)  # Avoid broken pipe in niri
+    except GLib.Error:
+        logger.debug("Failed to read reply from niri", exc_info=True)
+    finally:
+        connection.close(None)
+
+    if then:
+        niri_request(*then)
 
 
 class NiriWindowManager(GObject.Object):
@@ -206,11 +293,26 @@ class NiriWindowManager(GObject.Object):
 
     def __init__(self):
         super().__init__()
-        self.windows: dict[int, Window] = {}
+        # Windows are kept in least to most recently focused order
+        self.windows: OrderedDict[int, Window] = OrderedDict()
         self.workspaces: dict[int, Workspace] = {}
         self._windows_loaded = False
         self._workspaces_loaded = False
         self._n_failed_connection_attempts = 0
+        self._event_handlers = {
+            "WorkspacesChanged": self.on_workspaces_changed,
+            "WindowsChanged": self.on_windows_changed,
+            "WindowClosed": self.on_window_closed,
+            "WindowOpenedOrChanged": self.on_window_opened_or_changed,
+            "WindowFocusChanged": self.on_window_focus_changed,
+            "WorkspaceActivated": self.on_workspace_activated,
+            "WorkspaceUrgencyChanged": self.on_workspace_urgency_changed,
+            "WindowUrgencyChanged": self.on_window_urgency_changed,
+        }
+        # niri writes compact JSON, so every event line starts with '{"<Name>"'
+        self._event_prefixes = tuple(
+            b'{"' + event.encode() + b'"' for event in self._event_handlers
+        )
         self._start_socket_connection()
 
     def _start_socket_connection(self):
@@ -232,12 +334,13 @@ class NiriWindowManager(GObject.Object):
             raise e
 
     def on_workspaces_changed(self, workspace_changed):
-        now = time.time()
+        now = next_focus_time()
+        focused_time = next_focus_time()
         for workspace in workspace_changed["workspaces"]:
             last_focus_time = now
             workspace_id = workspace["id"]
             if workspace["is_focused"]:
-                last_focus_time = last_focus_time + 1
+                last_focus_time = focused_time
                 self.active_workspace = workspace_id
 
             self.workspaces[workspace_id] = Workspace(
@@ -246,16 +349,19 @@ class NiriWindowManager(GObject.Object):
         self._workspaces_loaded = True
 
     def on_windows_changed(self, windows_changed):
-        self.windows.clear()
-        now = time.time()
-        for window in windows_changed["windows"]:
-            last_focus_time = now
-            window_id = window["id"]
-            if window["is_focused"]:
-                last_focus_time = last_focus_time + 1
-                self.active_window = window_id
-            window = Window(window, last_focus_time=last_focus_time)
-            self.windows[window_id] = window
+        windows = windows_changed["windows"]
+        # The dict is kept in least to most recently used order and read in
+        # reverse, so fill it in reverse to list unfocused windows in niri's
+        # order
+        self.windows = OrderedDict(
+            (window["id"], Window(window)) for window in reversed(windows)
+        )
+        if focused := next(
+            (window for window in windows if window["is_focused"]), None
+        ):
+            window_id = focused["id"]
+            self.windows.move_to_end(window_id)
+            self.active_window = window_id
         self._windows_loaded = True
 
     def _queue_next_line_read(self):
@@ -265,9 +371,10 @@ class NiriWindowManager(GObject.Object):
 
     def _on_line_read(self, stream, result):
         try:
-            line = stream.read_line_finish_utf8(result)[0]
-            if line:
-                obj = json.loads(line)
+            line = stream.read_line_finish(result)[0]
+            # Skip decoding events that we don't handle
+            if line and line.startswith(self._event_prefixes):
+                obj = json_loads(line)
                 self._process_event(obj)
 
             self._queue_next_line_read()
@@ -283,47 +390,54 @@ class NiriWindowManager(GObject.Object):
             else:
                 logger.error("Error reading from socket. Is NIRI_SOCKET set?")
 
+    def on_window_closed(self, window_closed):
+        window_id = window_closed["id"]
+        if window_id in self.windows:
+            window = self.windows[window_id]
+            del self.windows[window_id]
+            self.emit("window-closed", window)
+
+    def on_window_opened_or_changed(self, opened_or_changed):
+        window = opened_or_changed["window"]
+        window_id = window["id"]
+        if exists := self.windows.get(window_id):
+            exists.update(window)
+            self.windows.move_to_end(window_id)
+        else:
+            self.windows[window_id] = Window(window)
+            self.emit("window-opened", self.windows[window_id])
+
+    def on_window_focus_changed(self, window_focus_changed):
+        window_id = window_focus_changed["id"]
+        if window_id in self.windows:
+            self.windows.move_to_end(window_id)
+            self.active_window = window_id
+            self.emit("window-focus-changed", self.windows[window_id])
+
+    def on_workspace_activated(self, workspace_activated):
+        previous = self.active_workspace
+        self.active_workspace = workspace_activated["id"]
+        workspace = self.workspaces[self.active_workspace]
+        workspace.last_focus_time = next_focus_time()
+        self.emit("workspace-activated", workspace, self.workspaces.get(previous))
+
+    def on_workspace_urgency_changed(self, workspace_urgency_changed):
+        workspace_id = workspace_urgency_changed["id"]
+        if workspace := self.workspaces.get(workspace_id):
+            workspace.is_urgent = workspace_urgency_changed["urgent"]
+            self.emit("workspace-urgency-changed", workspace)
+
+    def on_window_urgency_changed(self, window_urgency_changed):
+        window_id = window_urgency_changed["id"]
+        if window := self.windows.get(window_id):
+            window.is_urgent = window_urgency_changed["urgent"]
+            self.emit("window-urgency-changed", window)
+
     def _process_event(self, obj):
-        if workspace_changed := obj.get("WorkspacesChanged"):
-            self.on_workspaces_changed(workspace_changed)
-        elif windows_changed := obj.get("WindowsChanged"):
-            self.on_windows_changed(windows_changed)
-        elif window_closed := obj.get("WindowClosed"):
-            window_id = window_closed["id"]
-            if window_id in self.windows:
-                window = self.windows[window_id]
-                del self.windows[window_id]
-                self.emit("window-closed", window)
-        elif opened_or_changed := obj.get("WindowOpenedOrChanged"):
-            window = opened_or_changed["window"]
-            window_id = window["id"]
-            if exists := self.windows.get(window_id):
-                exists.update(window)
-            else:
-                self.windows[window_id] = Window(window)
-                self.emit("window-opened", self.windows[window_id])
-        elif window_focus_changed := obj.get("WindowFocusChanged"):
-            window_id = window_focus_changed["id"]
-            if window_id in self.windows:
-                self.windows[window_id].last_focus_time = time.time()
-                self.active_window = window_id
-                self.emit("window-focus-changed", self.windows[window_id])
-        elif workspace_activated := obj.get("WorkspaceActivated"):
-            previous = self.active_workspace
-            self.active_workspace = workspace_activated["id"]
-            workspace = self.workspaces[self.active_workspace]
-            workspace.last_focus_time = time.time()
-            self.emit("workspace-activated", workspace, self.workspaces.get(previous))
-        elif workspace_urgency_changed := obj.get("WorkspaceUrgencyChanged"):
-            workspace_id = workspace_urgency_changed["id"]
-            if workspace := self.workspaces.get(workspace_id):
-                workspace.is_urgent = workspace_urgency_changed["urgent"]
-                self.emit("workspace-urgency-changed", workspace)
-        elif window_urgency_changed := obj.get("WindowUrgencyChanged"):
-            window_id = window_urgency_changed["id"]
-            if window := self.windows.get(window_id):
-                window.is_urgent = window_urgency_changed["urgent"]
-                self.emit("window-urgency-changed", window)
+        # Each event is a single-key object, e.g., {"WindowClosed": {...}}
+        event, payload = next(iter(obj.items()))
+        if handler := self._event_handlers.get(event):
+            handler(payload)
 
     def get_workspace(self, workspace_id: int) -> Workspace | None:
         return self.workspaces.get(workspace_id, None)
@@ -381,7 +495,7 @@ class NiriWindowManager(GObject.Object):
     def get_windows(
         self, active_workspace=True, workspace_id=None, active_output=False
     ) -> list[Window]:
-        windows = self.windows.values()
+        windows = reversed(self.windows.values())
         if active_output:
             current_workspace = self.get_active_workspace()
 
@@ -406,7 +520,24 @@ class NiriWindowManager(GObject.Object):
                 windows,
             )
 
-        return sorted(windows, key=operator.attrgetter("last_focus_time"), reverse=True)
+        return list(windows)
+
+    def get_windows_by_workspace(self) -> dict[int, list[Window]]:
+        """
+        Returns the windows of every workspace, most recently focused first.
+
+        This is equivalent to calling `get_windows(workspace_id=...)` for each
+        workspace, but only walks the windows once. Windows that are not on a
+        workspace are included for every workspace.
+        """
+        windows_by_workspace = {workspace_id: [] for workspace_id in self.workspaces}
+        for window in reversed(self.windows.values()):
+            if window.workspace_id == -1:
+                for windows in windows_by_workspace.values():
+                    windows.append(window)
+            elif (windows := windows_by_workspace.get(window.workspace_id)) is not None:
+                windows.append(window)
+        return windows_by_workspace
 
     def get_workspaces(self, mru=False, active_output=False):
         workspaces = []